@@ -1,9 +1,236 @@
 # -*- coding: utf-8 -*-
+import multiprocessing as mp
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import lru_cache
+from itertools import repeat
+from typing import Optional
+
 import bw2calc as bc
 import bw2data as bd
 import numpy as np
 import pandas as pd
 import scipy.sparse
+import scipy.sparse.linalg
+from bw2calc import PYPARDISO
+
+
+class MatrixDict(MutableMapping):
+    """
+    Dictionary interface over the nonzero entries of a sparse matrix.
+
+    The exchange amounts live in one contiguous ``float64`` array (``self.array``, in COO
+    order) and the keys map to their position in that array, so writing an amount is a
+    single array store and the array can be handed to the matrix rebuild without
+    copying it out of the dict. The keys are fixed at construction: the sparsity pattern
+    of the matrix cannot change, so entries can be updated but not added or removed.
+
+    :param keys: ``(row_key, col_key)`` tuples in COO order.
+    :type keys: list
+
+    :param values: Exchange amounts in COO order.
+    :type values: numpy.ndarray
+    """
+
+    def __init__(self, keys: list, values: np.ndarray) -> None:
+        self._key_to_idx = dict(zip(keys, range(len(keys))))
+        self.array = np.array(values, dtype=np.float64)
+
+    def __getitem__(self, key) -> float:
+        return self.array[self._key_to_idx[key]]
+
+    def __setitem__(self, key, value: float) -> None:
+        self.array[self._key_to_idx[key]] = value
+
+    def __delitem__(self, key) -> None:
+        raise TypeError("Entries can not be removed from the sparse matrix")
+
+    def __contains__(self, key) -> bool:
+        return key in self._key_to_idx
+
+    def __iter__(self):
+        return iter(self._key_to_idx)
+
+    def __len__(self) -> int:
+        return len(self._key_to_idx)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, dict(zip(self, self.array.tolist())))
+
+    def set_many(self, keys: list, values) -> None:
+        """
+        Writes the amounts of several entries with a single array store.
+
+        All keys are resolved before anything is written, so an unknown key leaves the
+        matrix unchanged.
+
+        :param keys: ``(row_key, col_key)`` tuples of existing entries.
+        :type keys: list
+
+        :param values: New amounts, in the same order as ``keys``.
+        :type values: numpy.ndarray
+
+        :raises KeyError: If one of the keys is not an entry of the matrix.
+        """
+        idx = np.fromiter(
+            map(self._key_to_idx.get, keys, repeat(-1)), dtype=np.intp, count=len(keys)
+        )
+        missing = np.flatnonzero(idx < 0)
+        if missing.size:
+            raise KeyError(keys[missing[0]])
+        self.array[idx] = values
+
+
+def _write_exchanges(matrix, keys: list, amounts: list, matrix_name: str) -> None:
+    """
+    Checks the amounts collected from a process model report and writes them to
+    ``matrix`` in one batch (``LCA_matrix.tech_matrix`` or ``LCA_matrix.bio_matrix``).
+
+    :param matrix: Matrix dict to update.
+    :type matrix: ``MatrixDict`` or dict
+
+    :param keys: ``(row_key, col_key)`` tuples of the exchanges.
+    :type keys: list
+
+    :param amounts: Exchange amounts, in the same order as ``keys``.
+    :type amounts: list
+
+    :param matrix_name: ``'technosphere'`` or ``'biosphere'``, used in error messages.
+    :type matrix_name: str
+    """
+    values = np.array(amounts, dtype=np.float64)
+    nan = np.flatnonzero(np.isnan(values))
+    if nan.size:
+        raise ValueError(
+            "Amount for Exchange {} is Nan. The amount should be number, check the calculations in the process model".format(
+                keys[nan[0]]
+            )
+        )
+    if isinstance(matrix, MatrixDict):
+        try:
+            matrix.set_many(keys, values)
+        except KeyError as err:
+            raise KeyError(
+                "Exchange {} is calculated but not exist in LCA {}".format(err.args[0], matrix_name)
+            ) from None
+    else:
+        for key, value in zip(keys, amounts):
+            if key not in matrix:
+                raise KeyError(
+                    "Exchange {} is calculated but not exist in LCA {}".format(key, matrix_name)
+                )
+            matrix[key] = value
+
+
+# Stream prefixes of the Transfer_Station waste materials (e.g. ``'DryRes_Paper'``)
+_TRANSFER_STATION_PREFIXES = frozenset(("DryRes", "WetRes", "ORG", "REC"))
+
+# ``LCA_matrix._prepare_lca_inputs`` results, least recently used first, see
+# ``LCA_matrix.clear_cache``
+_LCA_INPUT_CACHE: OrderedDict = OrderedDict()
+
+# Number of LCA inputs kept in ``_LCA_INPUT_CACHE``
+_LCA_INPUT_CACHE_SIZE = 8
+
+
+def _cached_lca_inputs(key: tuple, build) -> tuple:
+    """
+    Returns the LCA inputs cached under `key`, calling `build()` on a miss.
+
+    The first three items of `key` name the LCA (project, functional unit and method)
+    and the others the state of the data. Inputs of the same LCA built from older data
+    are dropped when new ones are built, and at most ``_LCA_INPUT_CACHE_SIZE`` inputs
+    are kept, so long optimization or Monte Carlo sessions do not keep superseded
+    datapackages alive.
+
+    :param key: Cache key, as built by ``LCA_matrix._prepare_lca_inputs``.
+    :type key: tuple
+
+    :param build: Function without arguments returning the inputs.
+    :type build: callable
+
+    :rtype: tuple
+    """
+    inputs = _LCA_INPUT_CACHE.get(key)
+    if inputs is not None:
+        _LCA_INPUT_CACHE.move_to_end(key)
+        return inputs
+    for stale in [cached for cached in _LCA_INPUT_CACHE if cached[:3] == key[:3]]:
+        del _LCA_INPUT_CACHE[stale]
+    inputs = _LCA_INPUT_CACHE[key] = build()
+    while len(_LCA_INPUT_CACHE) > _LCA_INPUT_CACHE_SIZE:
+        _LCA_INPUT_CACHE.popitem(last=False)
+    return inputs
+
+
+# `project` and `modified` are only cache-invalidation keys of the lru_cache
+@lru_cache(maxsize=None)
+def _activity_units(  # pylint: disable=unused-argument
+    project: str, process: str, modified: Optional[str]
+) -> tuple:
+    """
+    Reads the unit multiplier of every activity in the `process` database.
+
+    An activity unit like ``'0.5 Mg'`` gives a multiplier of 0.5; units without a
+    numeric prefix give 1. The result is cached per project and database; `modified` is
+    the ``'modified'`` timestamp of the database, so a rewritten database is read again.
+
+    :param project: Name of the Brightway project.
+    :type project: str
+
+    :param process: Name of the process database.
+    :type process: str
+
+    :param modified: Modification timestamp from ``bw2data.databases``.
+    :type modified: str
+
+    :return: ``(node_id, key, multiplier)`` tuples.
+    :rtype: tuple
+    """
+    units = []
+    for act in bd.Database(process):
+        unit = act.get("unit", "").split(" ")
+        units.append((act.id, act.key, float(unit[0]) if len(unit) > 1 else 1.0))
+    return tuple(units)
+
+
+# Sparse structure and impact weights of the LCA in a ``run_monte_carlo`` worker process
+_MC_STATE: dict = {}
+
+
+def _monte_carlo_init(state: dict) -> None:
+    _MC_STATE.update(state)
+
+
+def _monte_carlo_chunk(value_samples: np.ndarray) -> np.ndarray:
+    return _monte_carlo_scores(value_samples, **_MC_STATE)
+
+
+def _monte_carlo_scores(
+    value_samples: np.ndarray,
+    *,
+    perm: np.ndarray,
+    indices: np.ndarray,
+    indptr: np.ndarray,
+    shape: tuple,
+    weights: np.ndarray,
+    demand: np.ndarray,
+) -> np.ndarray:
+    """
+    Solves the LCA for each row of technosphere amounts in `value_samples` (COO order)
+    and returns the scores. `weights` is the characterized biosphere summed over the
+    flows, so the score of a supply vector is ``weights @ supply``.
+    """
+    technosphere = scipy.sparse.csr_matrix(
+        (np.empty(len(perm)), indices, indptr), shape=shape, copy=False
+    )
+    scores = np.empty(len(value_samples))
+    for i, values in enumerate(value_samples):
+        np.take(values, perm, out=technosphere.data)
+        scores[i] = weights @ scipy.sparse.linalg.spsolve(technosphere, demand)
+    return scores
 
 
 class LCA_matrix(bc.LCA):
@@ -11,22 +238,24 @@ class LCA_matrix(bc.LCA):
     Translates the row and col indices of the technosphere and biosphere sparse matrices
     to activity keys in the Brightway2 database.
 
-    ``self.tech_matrix`` is a dictionary that maps ``(product_key, activity_key)`` tuples
+    ``self.tech_matrix`` is a ``MatrixDict`` that maps ``(product_key, activity_key)`` tuples
     to exchange amounts. Example:
     ``{(('LF', 'Aerobic_Residual'), ('SF1_product', 'Aerobic_Residual_MRDO')): 0.828}``
 
-    ``self.bio_matrix`` is a dictionary that maps ``(biosphere_key, activity_key)`` tuples
+    ``self.bio_matrix`` is a ``MatrixDict`` that maps ``(biosphere_key, activity_key)`` tuples
     to exchange amounts. Example:
     ``{(('biosphere3', '0015ec22-72cb-4af1-8c7b-0ba0d041553c'), ('Technosphere', 'Boiler_Diesel')): 6.12e-15}``
 
     These dicts are updated by ``update_techmatrix`` and ``update_biomatrix`` and then
     used to rebuild the sparse matrices for Monte Carlo and Optimization runs via
-    ``rebuild_technosphere_matrix`` and ``rebuild_biosphere_matrix``.
+    ``rebuild_technosphere_matrix`` and ``rebuild_biosphere_matrix``. Their amounts are
+    stored in COO order in ``self.tech_matrix.array`` and ``self.bio_matrix.array``,
+    which the rebuild helpers use by default.
 
     """
 
     def __init__(self, functional_unit: dict, method: list) -> None:
-        fu, data_objs, _ = bd.prepare_lca_inputs(functional_unit, method=method[0])
+        fu, data_objs, remapping = self._prepare_lca_inputs(functional_unit, method[0])
         super().__init__(demand=fu, data_objs=data_objs)
         self.lci()
         self.lcia()
@@ -45,70 +274,323 @@ class LCA_matrix(bc.LCA):
         self._activities_dict_reversed = self.dicts.activity.reversed
         self._biosphere_dict_reversed = self.dicts.biosphere.reversed
 
+        # ``self.dicts`` stay keyed by integer node IDs (bw_temporalis indexes them that
+        # way), so the ``(database, code)`` keys come from the remapping dicts.
+        product_keys = self._matrix_keys(self.dicts.product, remapping["product"])
+        activity_keys = self._matrix_keys(self.dicts.activity, remapping["activity"])
+        biosphere_keys = self._matrix_keys(self.dicts.biosphere, remapping["biosphere"])
+
         # Build tech_matrix from sparse technosphere matrix (COO preserves entry order)
         tech_coo = self.technosphere_matrix.tocoo()
-        self._tech_coo_rows = tech_coo.row.copy()
-        self._tech_coo_cols = tech_coo.col.copy()
         self._tech_shape = self.technosphere_matrix.shape
+        idx_dtype = self._index_dtype(self._tech_shape, tech_coo.nnz)
+        self._tech_coo_rows = tech_coo.row.astype(idx_dtype)
+        self._tech_coo_cols = tech_coo.col.astype(idx_dtype)
+        self._tech_perm, self._tech_indices, self._tech_indptr = self._csr_structure(
+            self._tech_coo_rows, self._tech_coo_cols, self._tech_shape[0]
+        )
+        # Rebuilds write into the data buffer of this matrix instead of allocating a new one
+        self._tech_csr = scipy.sparse.csr_matrix(
+            (np.empty(len(self._tech_perm)), self._tech_indices, self._tech_indptr),
+            shape=self._tech_shape,
+            copy=False,
+        )
 
-        self.tech_matrix = {}
-        for i, j, v in zip(self._tech_coo_rows, self._tech_coo_cols, tech_coo.data):
-            row_key = self.dicts.product.reversed[i]
-            col_key = self.dicts.activity.reversed[j]
-            self.tech_matrix[(row_key, col_key)] = v
+        tech_keys = list(
+            zip(
+                product_keys[self._tech_coo_rows].tolist(),
+                activity_keys[self._tech_coo_cols].tolist(),
+            )
+        )
+        self.tech_matrix = MatrixDict(tech_keys, tech_coo.data)
 
         # Build bio_matrix from sparse biosphere matrix (COO preserves entry order)
         bio_coo = self.biosphere_matrix.tocoo()
-        self._bio_coo_rows = bio_coo.row.copy()
-        self._bio_coo_cols = bio_coo.col.copy()
         self._bio_shape = self.biosphere_matrix.shape
+        idx_dtype = self._index_dtype(self._bio_shape, bio_coo.nnz)
+        self._bio_coo_rows = bio_coo.row.astype(idx_dtype)
+        self._bio_coo_cols = bio_coo.col.astype(idx_dtype)
+        self._bio_perm, self._bio_indices, self._bio_indptr = self._csr_structure(
+            self._bio_coo_rows, self._bio_coo_cols, self._bio_shape[0]
+        )
+        # Rebuilds write into the data buffer of this matrix instead of allocating a new one
+        self._bio_csr = scipy.sparse.csr_matrix(
+            (np.empty(len(self._bio_perm)), self._bio_indices, self._bio_indptr),
+            shape=self._bio_shape,
+            copy=False,
+        )
 
-        self.bio_matrix = {}
-        _bio_seen: set = set()
-        for i, j, v in zip(self._bio_coo_rows, self._bio_coo_cols, bio_coo.data):
-            bio_key = self.dicts.biosphere.reversed[i]
-            col_key = self.dicts.activity.reversed[j]
-            key = (bio_key, col_key)
-            if key not in _bio_seen:
-                self.bio_matrix[key] = v
-                _bio_seen.add(key)
-            else:
-                # Defensive: handle rare duplicate biosphere flows by appending suffix
-                self.bio_matrix[(str(bio_key) + " - 1", col_key)] = v
+        bio_keys = list(
+            zip(
+                biosphere_keys[self._bio_coo_rows].tolist(),
+                activity_keys[self._bio_coo_cols].tolist(),
+            )
+        )
+        # Keys are unique exactly when the (row, col) pairs are, which one np.unique checks
+        pair_ids = self._bio_coo_rows.astype(np.int64) * self._bio_shape[1] + self._bio_coo_cols
+        if np.unique(pair_ids).size != pair_ids.size:
+            # Defensive: handle rare duplicate biosphere flows by appending suffix
+            _bio_seen: set = set()
+            for i, key in enumerate(bio_keys):
+                if key not in _bio_seen:
+                    _bio_seen.add(key)
+                else:
+                    bio_keys[i] = (str(key[0]) + " - 1", key[1])
+        self.bio_matrix = MatrixDict(bio_keys, bio_coo.data)
+
+    @staticmethod
+    def _prepare_lca_inputs(functional_unit: dict, method: tuple) -> tuple:
+        """
+        Cached ``bw2data.prepare_lca_inputs``.
+
+        The inputs are reused for the same project, functional unit and method as long as
+        no database has been processed again and the method has not been rewritten. Call
+        ``LCA_matrix.clear_cache()`` to drop them explicitly. A method that is not
+        registered is not cached, so ``prepare_lca_inputs`` reports it as usual.
+
+        :param functional_unit: Functional unit of the LCA.
+        :type functional_unit: dict
+
+        :param method: LCIA method.
+        :type method: tuple
+
+        :return: ``(demand, data_objs, remapping_dicts)``, as from ``prepare_lca_inputs``.
+        :rtype: tuple
+        """
+        # prepare_lca_inputs processes dirty databases first; do it before reading their
+        # timestamps so the key reflects the data the inputs would be built from.
+        if method not in bd.methods:
+            # Not cacheable (there is no processed method file); let bw2data report it
+            return bd.prepare_lca_inputs(functional_unit, method=method)
+        bd.databases.clean()
+        key = (
+            bd.projects.current,
+            frozenset((getattr(act, "id", act), amount) for act, amount in functional_unit.items()),
+            method,
+            tuple(sorted((name, meta.get("processed")) for name, meta in bd.databases.items())),
+            os.stat(bd.Method(method).filepath_processed()).st_mtime_ns,
+        )
+        fu, data_objs, remapping = _cached_lca_inputs(
+            key, lambda: bd.prepare_lca_inputs(functional_unit, method=method)
+        )
+        return dict(fu), list(data_objs), dict(remapping)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drops the cached LCA inputs and activity units. Only needed when the databases are
+        modified in a way that does not update their ``processed`` timestamp.
+        """
+        _LCA_INPUT_CACHE.clear()
+        _activity_units.cache_clear()
+
+    @staticmethod
+    def _matrix_keys(matrix_dict, remapping: dict) -> np.ndarray:
+        """
+        Returns the ``(database, code)`` key of every row (or column) of a matrix as an
+        object array, so COO index arrays can be translated with a single fancy-index.
+        The key strings are interned: every matrix entry of a row shares the same key
+        tuple, and lookups with interned strings compare by identity.
+
+        :param matrix_dict: One of ``self.dicts.{activity, product, biosphere}``.
+        :type matrix_dict: ``bw2calc.dictionary_manager.ReversibleRemappableDictionary``
+
+        :param remapping: Mapping from node IDs to ``(database, code)`` keys.
+        :type remapping: dict
+
+        :return: Keys indexed by matrix row (or column) number.
+        :rtype: numpy.ndarray
+        """
+        reversed_dict = matrix_dict.reversed
+        size = len(reversed_dict)
+        keys = map(remapping.__getitem__, map(reversed_dict.__getitem__, range(size)))
+        return np.fromiter(
+            ((sys.intern(db), sys.intern(code)) for db, code in keys),
+            dtype=object,
+            count=size,
+        )
+
+    @staticmethod
+    def _index_dtype(shape: tuple, nnz: int) -> type:
+        """
+        Returns ``int32`` for the sparse index arrays when the matrix is small enough,
+        which is what scipy uses itself, so building the CSR matrices does not convert
+        (copy) the index arrays.
+
+        :param shape: Shape of the matrix.
+        :type shape: tuple
+
+        :param nnz: Number of matrix entries.
+        :type nnz: int
+
+        :rtype: type
+        """
+        return np.int32 if max(*shape, nnz) < np.iinfo(np.int32).max else np.int64
+
+    @staticmethod
+    def _check_values(values: np.ndarray, nnz: int) -> None:
+        """
+        Checks that `values` can be gathered into a CSR data buffer without a conversion.
+
+        :param values: Exchange amounts in COO entry order.
+        :type values: numpy.ndarray
+
+        :param nnz: Number of matrix entries.
+        :type nnz: int
+
+        :raises ValueError: If `values` is not a contiguous ``float64`` array of `nnz`
+            amounts.
+        """
+        if not isinstance(values, np.ndarray) or values.shape != (nnz,):
+            raise ValueError(
+                "Expected an array of {} exchange amounts, got {}".format(
+                    nnz, getattr(values, "shape", type(values).__name__)
+                )
+            )
+        if values.dtype != np.float64 or not values.flags.c_contiguous:
+            raise ValueError(
+                "Exchange amounts should be a contiguous float64 array, got {} ({})".format(
+                    values.dtype, "contiguous" if values.flags.c_contiguous else "strided"
+                )
+            )
+
+    @staticmethod
+    def _csr_structure(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> tuple:
+        """
+        Computes the CSR layout of a fixed sparsity pattern given in COO order.
+
+        Rebuilding a CSR matrix from ``(values, (rows, cols))`` sorts the indices every
+        time. The pattern does not change between rebuilds, so the sort is done once
+        here and a rebuild only has to reorder the values with ``perm``.
+
+        :param rows: COO row indices.
+        :type rows: numpy.ndarray
+
+        :param cols: COO column indices.
+        :type cols: numpy.ndarray
+
+        :param n_rows: Number of rows in the matrix.
+        :type n_rows: int
+
+        :return: ``(perm, indices, indptr)`` where ``values[perm]`` is the CSR data array.
+        :rtype: tuple
+        """
+        perm = np.lexsort((cols, rows))
+        indices = cols[perm]
+        indptr = np.zeros(n_rows + 1, dtype=indices.dtype)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return perm, indices, indptr
 
     # ------------------------------------------------------------------
     # Matrix rebuild helpers (BW2.5 replacement for rebuild_*_matrix)
     # ------------------------------------------------------------------
 
-    def rebuild_technosphere_matrix(self, values: np.ndarray) -> None:
+    def rebuild_technosphere_matrix(self, values: Optional[np.ndarray] = None) -> None:
         """
         Rebuild the technosphere sparse matrix from an ordered array of values.
 
         The values array must be in the same insertion order as ``self.tech_matrix``
-        (i.e., COO order from matrix initialisation).
+        (i.e., COO order from matrix initialisation). The values are written into a
+        preallocated CSR matrix, so every rebuild returns the same matrix object with
+        updated data; copy ``self.technosphere_matrix`` to keep a snapshot.
 
-        :param values: New exchange amounts in COO entry order.
-        :type values: numpy.ndarray
-        """
-        self.technosphere_matrix = scipy.sparse.csr_matrix(
-            (values, (self._tech_coo_rows, self._tech_coo_cols)),
-            shape=self._tech_shape,
-        )
+        :param values: New exchange amounts in COO entry order (contiguous ``float64``).
+            Defaults to ``self.tech_matrix.array``.
+        :type values: numpy.ndarray, optional
 
-    def rebuild_biosphere_matrix(self, values: np.ndarray) -> None:
+        :raises ValueError: If `values` has the wrong length, dtype or memory layout.
+        """
+        if values is None:
+            values = self.tech_matrix.array
+        self._check_values(values, len(self._tech_perm))
+        np.take(values, self._tech_perm, out=self._tech_csr.data)
+        self.technosphere_matrix = self._tech_csr
+        # A factorization of the previous values would give wrong results
+        if hasattr(self, "solver"):
+            del self.solver
+
+    def rebuild_biosphere_matrix(self, values: Optional[np.ndarray] = None) -> None:
         """
         Rebuild the biosphere sparse matrix from an ordered array of values.
 
         The values array must be in the same insertion order as ``self.bio_matrix``
-        (i.e., COO order from matrix initialisation).
+        (i.e., COO order from matrix initialisation). The values are written into a
+        preallocated CSR matrix, so every rebuild returns the same matrix object with
+        updated data; copy ``self.biosphere_matrix`` to keep a snapshot.
 
-        :param values: New exchange amounts in COO entry order.
-        :type values: numpy.ndarray
+        :param values: New exchange amounts in COO entry order (contiguous ``float64``).
+            Defaults to ``self.bio_matrix.array``.
+        :type values: numpy.ndarray, optional
+
+        :raises ValueError: If `values` has the wrong length, dtype or memory layout.
         """
-        self.biosphere_matrix = scipy.sparse.csr_matrix(
-            (values, (self._bio_coo_rows, self._bio_coo_cols)),
-            shape=self._bio_shape,
-        )
+        if values is None:
+            values = self.bio_matrix.array
+        self._check_values(values, len(self._bio_perm))
+        np.take(values, self._bio_perm, out=self._bio_csr.data)
+        self.biosphere_matrix = self._bio_csr
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solves the technosphere matrix for `rhs`. The matrix is factorized on the first
+        call and the factorization is reused until the next
+        ``rebuild_technosphere_matrix``, so solving for several demands costs one
+        factorization. With pypardiso, which keeps its own factorization, this is the same
+        as ``solve_linear_system``.
+
+        :param rhs: Demand array (or right-hand side) in matrix row order.
+        :type rhs: numpy.ndarray
+
+        :return: Supply array.
+        :rtype: numpy.ndarray
+        """
+        if not PYPARDISO and not hasattr(self, "solver"):
+            self.decompose_technosphere()
+        return self.solve_linear_system(rhs)
+
+    def run_monte_carlo(self, value_samples: np.ndarray, n_workers: int = 1) -> np.ndarray:
+        """
+        Calculates the LCA score for each sample of technosphere amounts, spreading the
+        samples over `n_workers` processes.
+
+        Each sample is a full set of ``self.tech_matrix`` amounts in COO order (see
+        ``self.tech_matrix.array``). The biosphere matrix and the characterization
+        matrix of the current method are kept fixed. The workers only receive the CSR
+        structure of the technosphere, the characterized biosphere and the demand
+        array, not the LCA object.
+
+        :param value_samples: Technosphere amounts, one sample per row.
+        :type value_samples: numpy.ndarray
+
+        :param n_workers: Number of worker processes; 1 runs in the current process.
+        :type n_workers: int, optional
+
+        :return: LCA score of each sample.
+        :rtype: numpy.ndarray
+        """
+        value_samples = np.asarray(value_samples, dtype=np.float64)
+        if value_samples.ndim != 2 or value_samples.shape[1] != len(self._tech_perm):
+            raise ValueError(
+                "value_samples should have shape (n_samples, {}), got {}".format(
+                    len(self._tech_perm), value_samples.shape
+                )
+            )
+        state = {
+            "perm": self._tech_perm,
+            "indices": self._tech_indices,
+            "indptr": self._tech_indptr,
+            "shape": self._tech_shape,
+            "weights": np.asarray(
+                (self.characterization_matrix @ self.biosphere_matrix).sum(axis=0)
+            ).ravel(),
+            "demand": self.demand_array,
+        }
+        if n_workers <= 1:
+            return _monte_carlo_scores(value_samples, **state)
+
+        chunks = np.array_split(value_samples, n_workers)
+        with mp.Pool(processes=n_workers, initializer=_monte_carlo_init, initargs=(state,)) as pool:
+            return np.concatenate(pool.map(_monte_carlo_chunk, chunks))
 
     # ------------------------------------------------------------------
     # Static matrix update helpers
@@ -131,111 +613,41 @@ class LCA_matrix(bc.LCA):
         :type tech_matrix: ``LCA_matrix.tech_matrix``
 
         """
+        keys = []
+        amounts = []
         for material, value in report_dict["Technosphere"].items():
+            col_key = (process_name, material)
             for key2, value2 in value.items():
-                if not np.isnan(value2):
-                    if ((key2), (process_name, material)) in tech_matrix.keys():
-                        if tech_matrix[((key2), (process_name, material))] != value2:
-                            tech_matrix[((key2), (process_name, material))] = value2
-                    else:
-                        raise KeyError(
-                            "Exchange {} is calculated but not exist in LCA technosphere".format(
-                                ((key2), (process_name, material))
-                            )
-                        )
-                else:
-                    raise ValueError(
-                        "Amount for Exchange {} is Nan. The amount should be number, check the calculations in the process model".format(
-                            ((key2), (process_name, material))
-                        )
-                    )
+                keys.append((key2, col_key))
+                amounts.append(value2)
 
+        product_db = process_name + "_product"
+        transfer_station = report_dict["process name"][1] == "Transfer_Station"
         for material, value in report_dict["Waste"].items():
+            # Remove prefix from material name in the case of Transfer Station
+            material_ = material
+            if transfer_station:
+                prefix, sep, rest = material.partition("_")
+                if sep and prefix in _TRANSFER_STATION_PREFIXES:
+                    material_ = rest
+            col_key = (process_name, material)
             for key2, value2 in value.items():
-                # Remove prefix from material name in the case of Transfer Station
-                if report_dict["process name"][1] == "Transfer_Station":
-                    if "DryRes" == material[0:6] or "WetRes" == material[0:6]:
-                        material_ = material[7:]
-                    elif "ORG" == material[0:3] or "REC" == material[0:3]:
-                        material_ = material[4:]
-                else:
-                    material_ = material
-                key2 = (process_name + "_product", material_ + "_" + key2)
-                if not np.isnan(value2):
-                    if ((key2), (process_name, material)) in tech_matrix.keys():
-                        if tech_matrix[((key2), (process_name, material))] != value2:
-                            tech_matrix[((key2), (process_name, material))] = value2
-                    else:
-                        raise KeyError(
-                            "Exchange {} is calculated but not exist in LCA technosphere".format(
-                                ((key2), (process_name, material))
-                            )
-                        )
-
-                else:
-                    raise ValueError(
-                        "Amount for Exchange {} is Nan. The amount should be number, check the calculations in the process model".format(
-                            ((key2), (process_name, material))
-                        )
-                    )
-
-            ### Adding activity for transport between the collection and treatment processes
-            if "LCI" in report_dict.keys():
-                for y in report_dict["LCI"].keys():
-                    for m in report_dict["LCI"][y].keys():
-                        for n in report_dict["LCI"][y][m].keys():
-                            if "biosphere3" not in n:
-                                if not np.isnan(report_dict["LCI"][y][m][n]):
-                                    if (
-                                        n,
-                                        (process_name + "_product", y + "_" + "to" + "_" + m),
-                                    ) in tech_matrix.keys():
-                                        if (
-                                            tech_matrix[
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            ]
-                                            != report_dict["LCI"][y][m][n]
-                                        ):
-                                            tech_matrix[
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            ] = report_dict["LCI"][y][m][n]
-                                    else:
-                                        raise KeyError(
-                                            "Exchange {} is calculated but not exist in LCA technosphere".format(
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            )
-                                        )
-                                else:
-                                    raise ValueError(
-                                        """Amount for Exchange {} is Nan. The amount should be number,
-                                                     check the calculations in the process model""".format(
-                                            (
-                                                n,
-                                                (
-                                                    process_name + "_product",
-                                                    y + "_" + "to" + "_" + m,
-                                                ),
-                                            )
-                                        )
-                                    )
+                keys.append(((product_db, material_ + "_" + key2), col_key))
+                amounts.append(value2)
+
+        ### Adding activity for transport between the collection and treatment processes
+        # (also when there is no waste; this used to run inside the waste loop only)
+        if "LCI" in report_dict:
+            for y, y_lci in report_dict["LCI"].items():
+                for m, m_lci in y_lci.items():
+                    col_key = (product_db, y + "_to_" + m)
+                    for n, value2 in m_lci.items():
+                        if "biosphere3" in n:
+                            continue
+                        keys.append((n, col_key))
+                        amounts.append(value2)
+
+        _write_exchanges(tech_matrix, keys, amounts, "technosphere")
 
     @staticmethod
     def update_biomatrix(process_name: str, report_dict: dict, bio_matrix: dict) -> None:
@@ -254,74 +666,27 @@ class LCA_matrix(bc.LCA):
         :type bio_matrix: ``LCA_matrix.bio_matrix``
 
         """
+        keys = []
+        amounts = []
         for material, value in report_dict["Biosphere"].items():
+            col_key = (process_name, material)
             for key2, value2 in value.items():
-                if not np.isnan(value2):
-                    if bio_matrix[((key2), (process_name, material))] != value2:
-                        bio_matrix[((key2), (process_name, material))] = value2
-                else:
-                    raise ValueError(
-                        "Amount for Exchange {} is Nan. The amount should be number, check the calculations in the process model".format(
-                            ((key2), (process_name, material))
-                        )
-                    )
-            ### Adding activity for collection cost
-            if "LCI" in report_dict.keys():
-                for y in report_dict["LCI"].keys():
-                    for m in report_dict["LCI"][y].keys():
-                        for n in report_dict["LCI"][y][m].keys():
-                            if "biosphere3" in n:
-                                if not np.isnan(report_dict["LCI"][y][m][n]):
-                                    if (
-                                        n,
-                                        (process_name + "_product", y + "_" + "to" + "_" + m),
-                                    ) in bio_matrix.keys():
-                                        if (
-                                            bio_matrix[
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            ]
-                                            != report_dict["LCI"][y][m][n]
-                                        ):
-                                            bio_matrix[
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            ] = report_dict["LCI"][y][m][n]
-                                    else:
-                                        raise KeyError(
-                                            "Exchange {} is calculated but not exist in LCA biosphere".format(
-                                                (
-                                                    n,
-                                                    (
-                                                        process_name + "_product",
-                                                        y + "_" + "to" + "_" + m,
-                                                    ),
-                                                )
-                                            )
-                                        )
-                                else:
-                                    raise ValueError(
-                                        """Amount for Exchange {} is Nan. The amount should be number,
-                                                     check the calculations in the process model""".format(
-                                            (
-                                                n,
-                                                (
-                                                    process_name + "_product",
-                                                    y + "_" + "to" + "_" + m,
-                                                ),
-                                            )
-                                        )
-                                    )
+                keys.append((key2, col_key))
+                amounts.append(value2)
+
+        ### Adding activity for collection cost
+        if "LCI" in report_dict:
+            product_db = process_name + "_product"
+            for y, y_lci in report_dict["LCI"].items():
+                for m, m_lci in y_lci.items():
+                    col_key = (product_db, y + "_to_" + m)
+                    for n, value2 in m_lci.items():
+                        if "biosphere3" not in n:
+                            continue
+                        keys.append((n, col_key))
+                        amounts.append(value2)
+
+        _write_exchanges(bio_matrix, keys, amounts, "biosphere")
 
     @staticmethod
     def get_mass_flow(LCA, process: str) -> float:
@@ -339,15 +704,8 @@ class LCA_matrix(bc.LCA):
         :rtype: float
 
         """
-        mass = 0
-        for i in LCA.dicts.activity:
-            if process == i[0]:
-                unit = bd.get_node(database=i[0], code=i[1]).as_dict()["unit"].split(" ")
-                if len(unit) > 1:
-                    mass += LCA.supply_array[LCA.dicts.activity[i]] * float(unit[0])
-                else:
-                    mass += LCA.supply_array[LCA.dicts.activity[i]]
-        return mass
+        idx, mul, _ = LCA_matrix._mass_flow_index(LCA, process)
+        return float(mul @ LCA.supply_array[idx])
 
     @staticmethod
     def get_mass_flow_comp(LCA, process: str, index) -> pd.Series:
@@ -368,14 +726,44 @@ class LCA_matrix(bc.LCA):
         :rtype: pandas.core.series.Series
 
         """
-        mass = pd.Series(np.zeros(len(index)), index=index)
-        for i in LCA.dicts.activity:
-            if process == i[0]:
-                for j in index:
-                    if j == i[1]:
-                        unit = bd.get_node(database=i[0], code=i[1]).as_dict()["unit"].split(" ")
-                        if len(unit) > 1:
-                            mass[j] += LCA.supply_array[LCA.dicts.activity[i]] * float(unit[0])
-                        else:
-                            mass[j] += LCA.supply_array[LCA.dicts.activity[i]]
-        return mass
+        idx, mul, codes = LCA_matrix._mass_flow_index(LCA, process)
+        pos = {name: k for k, name in enumerate(index)}
+        target = np.fromiter(map(pos.get, codes, repeat(-1)), dtype=np.intp, count=len(codes))
+        in_index = target >= 0
+        mass = np.zeros(len(index))
+        np.add.at(mass, target[in_index], LCA.supply_array[idx[in_index]] * mul[in_index])
+        return pd.Series(mass, index=index)
+
+    @staticmethod
+    def _mass_flow_index(LCA, process: str) -> tuple:
+        """
+        Returns the supply array positions, unit multipliers and codes of the activities
+        in the `process` database. The result is cached on `LCA`; the unit multipliers come
+        from ``_activity_units``, which is shared between LCA objects.
+
+        :param LCA: LCA object.
+        :type LCA: ``bw2calc.lca.LCA`` or ``swolfpy.LCA_matrix.LCA_matrix``
+
+        :param process: Name of the process databases.
+        :type process: str
+
+        :return: ``(idx, mul, codes)`` with ``idx`` and ``mul`` as arrays.
+        :rtype: tuple
+        """
+        cache = LCA.__dict__.setdefault("_mass_flow_cache", {})
+        if process not in cache:
+            activity_dict = LCA.dicts.activity
+            idx, mul, codes = [], [], []
+            units = _activity_units(
+                bd.projects.current, process, bd.databases[process].get("modified")
+            )
+            for node_id, key, multiplier in units:
+                # ``dicts.activity`` is keyed by node ID unless it was remapped to keys
+                col = activity_dict.get(node_id, activity_dict.get(key))
+                if col is None:
+                    continue
+                idx.append(col)
+                mul.append(multiplier)
+                codes.append(key[1])
+            cache[process] = (np.array(idx, dtype=np.intp), np.array(mul), codes)
+        return cache[process]
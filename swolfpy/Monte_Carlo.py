@@ -3,10 +3,9 @@ import multiprocessing as mp
 import os
 
 import bw2data as bd
-import numpy as np
 import pandas as pd
 
-from .LCA_matrix import LCA_matrix
+from .LCA_matrix import LCA_matrix, MatrixDict
 
 
 class Monte_Carlo(LCA_matrix):
@@ -155,8 +154,8 @@ class Monte_Carlo(LCA_matrix):
     def parallel_mc(
         lca,
         method: list,
-        tech_matrix: dict,
-        bio_matrix: dict,
+        tech_matrix: MatrixDict,
+        bio_matrix: MatrixDict,
         process_models=None,
         process_model_names=None,
         parameters=None,
@@ -197,12 +196,9 @@ class Monte_Carlo(LCA_matrix):
                 if key in tech_matrix:
                     tech_matrix[key] = value
 
-        tech = np.array(list(tech_matrix.values()), dtype=float)
-        bio = np.array(list(bio_matrix.values()), dtype=float)
-
         # BW2.5-compatible matrix rebuild (replaces removed rebuild_*_matrix methods)
-        lca.rebuild_technosphere_matrix(tech)
-        lca.rebuild_biosphere_matrix(bio)
+        lca.rebuild_technosphere_matrix(tech_matrix.array)
+        lca.rebuild_biosphere_matrix(bio_matrix.array)
         lca.lci_calculation()
         lca.lcia_calculation()
 
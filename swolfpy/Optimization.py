@@ -148,11 +148,8 @@ class Optimization(LCA_matrix):
                     LCA_matrix.update_techmatrix(process_name, report_dict, self.tech_matrix)
                     LCA_matrix.update_biomatrix(process_name, report_dict, self.bio_matrix)
 
-            tech = np.array(list(self.tech_matrix.values()), dtype=float)
-            bio = np.array(list(self.bio_matrix.values()), dtype=float)
-
-            self.rebuild_technosphere_matrix(tech)
-            self.rebuild_biosphere_matrix(bio)
+            self.rebuild_technosphere_matrix()
+            self.rebuild_biosphere_matrix()
             self.lci_calculation()
             self.lcia_calculation()
 
@@ -2325,7 +2325,25 @@ ul {
         self.MC_Widget.MC_Res_Table.installEventFilter(self)
         self.MC_Widget.MC_Res_Table.setSortingEnabled(True)
 
-        ### Plot tab
+        ### Plot and Corr tabs are populated when they are first opened
+        self._mc_tabs_ready = set()
+        self.MC_Widget.tabWidget.currentChanged.connect(self.mc_setup_tab)
+
+        Dialog.show()
+        Dialog.exec_()
+
+    @QtCore.Slot(int)
+    def mc_setup_tab(self, index):
+        tab = self.MC_Widget.tabWidget.widget(index).objectName()
+        if tab in self._mc_tabs_ready:
+            return
+        if tab == "MC_Plot":
+            self.mc_setup_plot_tab()
+        elif tab == "MC_Corr":
+            self.mc_setup_corr_tab()
+        self._mc_tabs_ready.add(tab)
+
+    def mc_setup_plot_tab(self):
         # Figure initialization _ plot
         self.fig_plot_mc = Figure(figsize=(4, 5), dpi=65, facecolor=(1, 1, 1), edgecolor=(0, 0, 0))
         self.canvas_plot_mc = FigureCanvas(self.fig_plot_mc)
@@ -2356,7 +2374,7 @@ ul {
         self.MC_Widget.Update_plot.clicked.connect(self.mc_plot_func)
         self.MC_Widget.Update_dist_fig.clicked.connect(self.mc_plot_dist_func)
 
-        ### Corr Plot
+    def mc_setup_corr_tab(self):
         self.corr_data = self.MC_results.corr(method="pearson")
 
         self.fig_plot_corr = Figure(
@@ -2372,9 +2390,6 @@ ul {
         self.MC_Widget.Corr_Impact.addItems([str(x) for x in self._method_for_corr])
         self.MC_Widget.Update_Corr_fig.clicked.connect(self.mc_plot_corr_func)
 
-        Dialog.show()
-        Dialog.exec_()
-
     @QtCore.Slot()
     def mc_plot_corr_func(self):
         self.fig_plot_corr.clear()
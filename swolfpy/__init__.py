@@ -5,32 +5,97 @@
 Solid Waste Optimization Life-cycle Framework in Python(SwolfPy)
 """
 
+import importlib
 import sys
+import types
 import warnings
+from typing import TYPE_CHECKING
 
-from .dynamic_lca import DynamicLCA
-from .prospective_lca import ProspectiveLCA
-from .Monte_Carlo import Monte_Carlo
-from .Optimization import Optimization
-from .Project import Project
-from .swolfpy_method import import_methods
-from .Technosphere import Technosphere
 from .uuid_migration import BIOSPHERE_UUID_MIGRATION, migrate_biosphere_key, original_biosphere_key
 
+if TYPE_CHECKING:
+    from .dynamic_lca import DynamicLCA
+    from .Monte_Carlo import Monte_Carlo
+    from .Optimization import Optimization
+    from .Project import Project
+    from .prospective_lca import ProspectiveLCA
+    from .swolfpy_method import import_methods
+    from .Technosphere import Technosphere
+    from .UI.PySWOLF_run import MyQtApp
+
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-# GUI components require PySide2 (Python ≤3.10) or PySide6 (Python ≥3.11).
-# Make them optional so the core LCA engine can be used in headless environments
-# (tests, API servers, notebooks) without a Qt installation.
-try:
-    from PySide2 import QtWidgets
+# The LCA classes pull in bw2data, bw2calc, bw_temporalis, numpy and pandas.
+# They are imported on first attribute access (PEP 562) so that importing the
+# package, e.g. for ``--help`` or test collection, stays cheap.
+_LAZY = {
+    "DynamicLCA": ".dynamic_lca",
+    "ProspectiveLCA": ".prospective_lca",
+    "Monte_Carlo": ".Monte_Carlo",
+    "Optimization": ".Optimization",
+    "Project": ".Project",
+    "import_methods": ".swolfpy_method",
+    "Technosphere": ".Technosphere",
+}
+
+
+def _load_gui():
+    """
+    Import the Qt front end if possible.
+
+    GUI components require PySide2 (Python ≤3.10) or PySide6 (Python ≥3.11).
+    They are optional so the core LCA engine can be used in headless environments
+    (tests, API servers, notebooks) without a Qt installation.
+
+    :return: ``QtWidgets`` and ``MyQtApp``, or ``(None, None)`` without Qt
+    :rtype: tuple
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from PySide2 import QtWidgets
+
+        from .UI.PySWOLF_run import MyQtApp
+    except ImportError:  # PySide2 not installed or wrong Python version
+        return None, None
+    return QtWidgets, MyQtApp
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    elif name == "MyQtApp":
+        value = _load_gui()[1]
+    elif name == "_GUI_AVAILABLE":
+        value = _load_gui()[1] is not None
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    """
+    Keep the class, not the submodule, bound to names such as ``swolfpy.Project``.
+
+    The import system stores every imported submodule on the package under its own
+    name, which for ``Project``, ``Technosphere``, ``Monte_Carlo`` and ``Optimization``
+    is also the name of the class it defines (e.g. after ``import swolfpy.Project``).
+    The eager ``from .Project import Project`` used to overwrite these entries again;
+    ``__getattr__`` is not called for names that are already bound, so the binding
+    is replaced here instead.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and _LAZY.get(name) == "." + name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
 
-    from .UI.PySWOLF_run import MyQtApp
 
-    _GUI_AVAILABLE = True
-except ImportError:  # PySide2 not installed or wrong Python version
-    _GUI_AVAILABLE = False
-    MyQtApp = None  # type: ignore[assignment,misc]
+sys.modules[__name__].__class__ = _Package
 
 
 __all__ = [
@@ -63,7 +128,8 @@ class SwolfPy:
     """
 
     def __init__(self):
-        if not _GUI_AVAILABLE:
+        QtWidgets, MyQtApp = _load_gui()
+        if MyQtApp is None:
             raise RuntimeError(
                 "SwolfPy GUI requires PySide2 (Python ≤3.10) or PySide6 (Python ≥3.11). "
                 "Install one of them to use the desktop interface."
@@ -27,16 +27,316 @@ Example:
     >>> print(timeline_df.groupby("year")["gwp_kgco2eq"].sum())
 """
 
-from typing import Dict, Optional, Set
+import math
+import warnings
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
 
 import bw2data as bd
 import numpy as np
 import pandas as pd
+from bw2data.backends import ActivityDataset, ExchangeDataset, sqlite3_lci_db
 from bw_temporalis import TemporalDistribution, TemporalisLCA, Timeline
 from bw_temporalis.lcia import characterize_co2, characterize_methane
 
 from .LCA_matrix import LCA_matrix
 
+# Dynamic characterization function for each supported biosphere3 flow name. The
+# functions must be linear in the amount (see ``_characterization_curve``).
+_CHARACTERIZERS = MappingProxyType(
+    {
+        "Carbon dioxide, fossil": characterize_co2,
+        "Carbon dioxide, non-fossil": characterize_co2,
+        "Methane, fossil": characterize_methane,
+    }
+)
+
+
+class TimelineResult(NamedTuple):
+    """
+    Time-resolved GWP as parallel arrays, returned by ``DynamicLCA.calculate_arrays``.
+
+    Row ``i`` is the GWP in kg CO₂-eq of flow ``flow[i]`` emitted by activity
+    ``activity[i]`` in calendar year ``year[i]``; rows are sorted by year, flow and
+    activity.
+    """
+
+    year: np.ndarray
+    gwp_kgco2eq: np.ndarray
+    flow: np.ndarray
+    activity: np.ndarray
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the result as DataFrame with columns [year, gwp_kgco2eq, flow, activity].
+
+        :rtype: pd.DataFrame
+        """
+        return pd.DataFrame(self._asdict())
+
+
+# Flows characterized by ``DynamicLCA.calculate`` by default
+_DEFAULT_FLOWS = frozenset(
+    {
+        "Carbon dioxide, fossil",
+        "Carbon dioxide, non-fossil",
+        "Methane, fossil",
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _year_offsets(start: int, end: int, steps: int) -> np.ndarray:
+    """
+    Returns `steps` whole-year offsets from `start` to `end` (inclusive), read-only.
+    """
+    years = np.linspace(start, end, steps, dtype=int).astype("timedelta64[Y]")
+    years.setflags(write=False)
+    return years
+
+
+@lru_cache(maxsize=256)
+def _decay_unit(k: float, period: int) -> np.ndarray:
+    """
+    Returns the exponential decay profile ``k * exp(-k * t)`` for ``t = 0 .. period``
+    normalized to sum to 1, read-only.
+
+    The normalization uses the closed-form sum of the geometric series,
+    ``sum(exp(-k * t)) = (1 - exp(-k * (period + 1))) / (1 - exp(-k))``; the factor `k`
+    cancels out.
+
+    :raises ValueError: If `k` is zero, for which ``k * exp(-k * t)`` can not be normalized.
+    """
+    if k == 0:
+        raise ValueError("Decay constant 'k' of an exponential_decay profile must not be 0")
+    period = int(period)
+    # exp(-k * (t + 1)) = exp(-k * t) * exp(-k): one exp and a running product
+    unit = np.full(period + 1, math.exp(-k))
+    unit[0] = 1.0
+    np.cumprod(unit, out=unit)
+    unit *= math.expm1(-k) / math.expm1(-k * (period + 1))
+    unit.setflags(write=False)
+    return unit
+
+
+@lru_cache(maxsize=None)
+def _characterization_curve(characterizer, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the date offsets and the marginal (annual) radiative forcing that
+    `characterizer` computes for one unit of flow over `period` years, read-only.
+
+    ``characterize_co2`` and ``characterize_methane`` scale this curve by the amount of
+    each timeline row, so it only needs to be computed once per function and period.
+    """
+    unit = pd.Series({"date": pd.Timestamp(0), "amount": 1.0, "flow": 0, "activity": 0})
+    curve = characterizer(unit, period=period, cumulative=True)
+    offsets = curve["date"].to_numpy(dtype="datetime64[s]") - np.datetime64(0, "s")
+    cumulative = curve["amount"].to_numpy(dtype=np.float64)
+    forcing = np.zeros_like(cumulative)
+    np.subtract(cumulative[1:], cumulative[:-1], out=forcing[1:])
+    offsets.setflags(write=False)
+    forcing.setflags(write=False)
+    return offsets, forcing
+
+
+def _immediate(amount: float, _params: dict) -> TemporalDistribution:
+    return TemporalDistribution(
+        date=np.array([0], dtype="timedelta64[Y]"),
+        amount=np.array([amount]),
+    )
+
+
+def _exponential_decay(amount: float, params: dict) -> TemporalDistribution:
+    k = params["k"]  # decay constant (1/year)
+    period = int(params["period"])  # years
+    # Discretize continuous exponential: amount_i = total * k * exp(-k * t_i)
+    # Normalize so sum equals `amount` (mass balance)
+    return TemporalDistribution(
+        date=_year_offsets(0, period, period + 1),
+        amount=amount * _decay_unit(k, period),
+    )
+
+
+def _uniform(amount: float, params: dict) -> TemporalDistribution:
+    start = params.get("start", 0)
+    end = params["end"]
+    steps = params["steps"]
+    return TemporalDistribution(
+        date=_year_offsets(start, end, steps),
+        amount=np.full(steps, amount / steps),
+    )
+
+
+# Builder of every temporal distribution kind, called with (amount, params)
+_BUILDERS = MappingProxyType(
+    {
+        "immediate": _immediate,
+        "exponential_decay": _exponential_decay,
+        "uniform": _uniform,
+    }
+)
+
+
+def _new_temporal_distribution(kind: str, amount: float, params: dict) -> TemporalDistribution:
+    """
+    Builds the TemporalDistribution of a profile, see
+    ``DynamicLCA._build_temporal_distribution``.
+    """
+    builder = _BUILDERS.get(kind)
+    if builder is None:
+        raise ValueError(f"Unknown temporal distribution kind: {kind}")
+    return builder(amount, params)
+
+
+@lru_cache(maxsize=256)
+def _cached_temporal_distribution(kind: str, amount: float, params: tuple) -> TemporalDistribution:
+    """
+    Returns `_new_temporal_distribution` with `params` given as sorted items, cached and
+    with read-only arrays.
+    """
+    distribution = _new_temporal_distribution(kind, amount, dict(params))
+    distribution.date.setflags(write=False)
+    distribution.amount.setflags(write=False)
+    return distribution
+
+
+def _timeline_columns(timeline: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Returns the columns of a timeline dataframe as arrays, with dates in seconds.
+
+    :param timeline: Timeline dataframe with columns [date, amount, flow, activity].
+    :type timeline: pd.DataFrame
+
+    :rtype: dict[str, np.ndarray]
+    """
+    return {
+        "date": timeline["date"].to_numpy(dtype="datetime64[s]"),
+        "amount": timeline["amount"].to_numpy(dtype=np.float64),
+        "flow": timeline["flow"].to_numpy(),
+        "activity": timeline["activity"].to_numpy(),
+    }
+
+
+def _characterize_rows(
+    dates: np.ndarray,
+    amounts: np.ndarray,
+    characterizer,
+    period: int = 100,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Characterizes timeline rows over `period` years.
+
+    Gives the calendar years of the dates and the amounts of
+    ``Timeline.characterize_dataframe(characterizer, cumsum=False)`` with `characterizer`
+    over `period` years, one row per timeline row, but scales the characterization curve
+    for all rows at once instead of calling `characterizer` once per row.
+
+    :param dates: Dates of the timeline rows, datetime64[s].
+    :type dates: np.ndarray
+
+    :param amounts: Amounts of the timeline rows.
+    :type amounts: np.ndarray
+
+    :param characterizer: Characterization function from ``_CHARACTERIZERS``.
+    :type characterizer: callable
+
+    :param period: Number of years characterized after each emission.
+    :type period: int
+
+    :param out: Arrays to write the years (int64) and the forcing (float64) into,
+        both of shape ``(len(dates), period)``; new arrays by default.
+    :type out: tuple[np.ndarray, np.ndarray] | None
+
+    :return: Years since 1970 and marginal (annual) radiative forcing, both of shape
+        ``(len(dates), period)``.
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    offsets, forcing = _characterization_curve(characterizer, period)
+    if out is None:
+        out = (np.empty((len(dates), period), dtype=np.int64), np.empty((len(dates), period)))
+    years, marginal = out
+    np.multiply(amounts[:, None], forcing, out=marginal)
+    # Calendar years once per distinct emission date; timeline rows share few dates
+    starts, inverse = np.unique(dates, return_inverse=True)
+    start_years = (starts[:, None] + offsets).astype("datetime64[Y]").astype(np.int64)
+    np.take(start_years, inverse, axis=0, out=years, mode="clip")
+    return years, marginal
+
+
+def _annual_totals(
+    years: np.ndarray, amounts: np.ndarray, flows: np.ndarray, activities: np.ndarray
+) -> TimelineResult:
+    """
+    Sums characterized amounts per calendar year, flow and activity.
+
+    Every (year, flow, activity) combination gets a bin number that sorts like the
+    combination, so one ``np.bincount`` gives the sums already in output order.
+
+    :param years: Characterized years since 1970, int64, one row per timeline row.
+    :type years: np.ndarray
+
+    :param amounts: Characterized amounts, same shape as `years`.
+    :type amounts: np.ndarray
+
+    :param flows: Flow ID of each row of `years`.
+    :type flows: np.ndarray
+
+    :param activities: Activity ID of each row of `years`.
+    :type activities: np.ndarray
+
+    :return: Annual sums sorted by year, flow and activity.
+    :rtype: TimelineResult
+    """
+    flow_idx, flow_values = pd.factorize(flows, sort=True)
+    activity_idx, activity_values = pd.factorize(activities, sort=True)
+
+    first_year = years.min()
+    n_pairs = len(flow_values) * len(activity_values)
+    bins = years - first_year
+    bins *= n_pairs
+    bins += (flow_idx * len(activity_values) + activity_idx)[:, None]
+    bins = bins.ravel()
+    n_bins = (years.max() - first_year + 1) * n_pairs
+    amounts = amounts.ravel()
+    if n_bins <= 4 * len(bins):
+        present = np.zeros(n_bins, dtype=bool)
+        present[bins] = True
+        present = np.flatnonzero(present)
+        totals = np.bincount(bins, weights=amounts, minlength=n_bins)[present]
+    else:
+        # Too many empty bins, number the occupied ones only
+        present, bins = np.unique(bins, return_inverse=True)
+        totals = np.bincount(bins, weights=amounts)
+
+    year_bin, pair_bin = np.divmod(present, n_pairs)
+    flow_bin, activity_bin = np.divmod(pair_bin, len(activity_values))
+    return TimelineResult(
+        year=(year_bin + first_year + 1970).astype(np.int32),
+        gwp_kgco2eq=totals,
+        flow=flow_values[flow_bin],
+        activity=activity_values[activity_bin],
+    )
+
+
+# `project` and `modified` are only cache-invalidation keys of the lru_cache
+@lru_cache(maxsize=1024)
+def _lookup_flow_id(  # pylint: disable=unused-argument
+    project: str, modified: Optional[str], flow_name: str
+) -> Optional[int]:
+    """
+    Returns the ID of the first biosphere3 search result for `flow_name`, or ``None``.
+
+    Cached per project; `modified` is the ``'modified'`` timestamp of biosphere3, so a
+    rewritten (or recreated) database is searched again.
+    """
+    try:
+        results = bd.Database("biosphere3").search(flow_name)
+    except (IndexError, KeyError):
+        return None
+    return results[0].id if results else None
+
 
 class DynamicLCA:
     """
@@ -107,10 +407,18 @@ class DynamicLCA:
         # TemporalisLCA will be instantiated after attach_temporal_distributions()
         self._temporalis_lca: Optional[TemporalisLCA] = None
         self._timeline: Optional[Timeline] = None
+        # Timeline dataframe columns as arrays, see ``_timeline_columns``
+        self._timeline_arrays: Optional[Dict[str, np.ndarray]] = None
+        # (cutoff, max_calc, starting_datetime) of the traversal behind ``_timeline``
+        self._traversal_key: Optional[tuple] = None
+        # Characterized years and forcing, reused by later calls, see ``_work_buffers``
+        self._year_buf: Optional[np.ndarray] = None
+        self._gwp_buf: Optional[np.ndarray] = None
 
     def attach_temporal_distributions(
         self,
         process_temporal_profiles: Dict[str, Dict[str, Dict]],
+        fast_path: bool = True,
     ) -> None:
         """
         Attach TemporalDistribution objects to biosphere exchanges in Brightway databases.
@@ -136,6 +444,11 @@ class DynamicLCA:
 
         :type process_temporal_profiles: dict
 
+        :param fast_path: Update the matching exchange rows in bulk. With ``False``, or in
+            projects with revisions, every exchange is saved through the bw2data proxy,
+            which is slower but sends the usual save signals.
+        :type fast_path: bool
+
         Example:
             >>> lf_profile = {
             ...     "LF": {
@@ -143,7 +456,7 @@ class DynamicLCA:
             ...             "kind": "exponential_decay",
             ...             "params": {"k": 0.05, "period": 50}
             ...         },
-            ...         "Carbon dioxide, biogenic": {
+            ...         "Carbon dioxide, non-fossil": {
             ...             "kind": "exponential_decay",
             ...             "params": {"k": 0.02, "period": 100}
             ...         },
@@ -153,30 +466,158 @@ class DynamicLCA:
         """
         # Ensure we're in the correct Brightway project
         # (LCA_matrix object already has project context via functional_unit)
-        for process_name, flow_profiles in process_temporal_profiles.items():
+        for process_name in process_temporal_profiles:
             # Check if database exists
             if process_name not in bd.databases:
                 raise ValueError(
                     f"Database '{process_name}' not found in current Brightway project"
                 )
 
-            # Get all activities in this process database
-            db = bd.Database(process_name)
-            for act in db:
-                for exc in act.biosphere():
-                    flow_name = exc.input["name"]
-                    if flow_name in flow_profiles:
-                        profile = flow_profiles[flow_name]
-                        # TODO(LCA-REVIEW-PR-2): Document decay constant (k) source and site-specificity
-                        # Science review flagged: k=0.05/yr (CH4) and k=0.02/yr (CO2) are illustrative, not validated
-                        # Recommendation: Add reference to EPA LandGEM/IPCC Tier 2 for production calibration
-                        # Tracked in: ../docs/reviews/Review_PR-2_phase2-prd-dynamic-lca_2026-02-21.md
-                        td = self._build_temporal_distribution(
-                            exc["amount"], profile["kind"], profile.get("params", {})
+        unit_profiles = self._unit_profiles(process_temporal_profiles)
+        process_flow_names = self._process_flow_names(unit_profiles)
+        self.invalidate_traversal()
+
+        # Sourced projects (with revisions) need the signals sent by the proxy ``save``
+        if not fast_path or bd.projects.dataset.is_sourced:
+            self._attach_with_proxies(unit_profiles, process_flow_names)
+            return
+
+        # One SQLite transaction for all exchange updates instead of one commit per save
+        with sqlite3_lci_db.atomic():
+            for process_name, flow_units in unit_profiles.items():
+                # Flow keys with a profile, so that SQLite only returns the matching exchanges
+                flow_names = process_flow_names[process_name]
+                if not flow_names:
+                    continue
+                rows = ExchangeDataset.select().where(
+                    (ExchangeDataset.output_database == process_name)
+                    & (ExchangeDataset.type == "biosphere")
+                    & (ExchangeDataset.input_code.in_({code for _, code in flow_names}))
+                )
+                updated = []
+                for row in rows.iterator():
+                    flow_name = flow_names.get((row.input_database, row.input_code))
+                    if flow_name is None:
+                        continue
+                    unit = flow_units[flow_name]
+                    row.data["temporal_distribution"] = TemporalDistribution(
+                        date=unit.date, amount=unit.amount * row.data["amount"]
+                    )
+                    updated.append(row)
+                if updated:
+                    ExchangeDataset.bulk_update(
+                        updated, fields=[ExchangeDataset.data], batch_size=500
+                    )
+                    bd.databases.set_dirty(process_name)
+
+    def _attach_with_proxies(
+        self,
+        unit_profiles: Dict[str, Dict[str, TemporalDistribution]],
+        process_flow_names: Dict[str, Dict[Tuple[str, str], str]],
+    ) -> None:
+        """
+        Attach temporal distributions by saving every matching exchange through bw2data.
+
+        Slower than the bulk update of `attach_temporal_distributions`, but each save
+        sends the signals that record revisions in sourced projects.
+
+        :param unit_profiles: Unit distributions as returned by `_unit_profiles`.
+        :type unit_profiles: dict
+
+        :param process_flow_names: Flow names as returned by `_process_flow_names`.
+        :type process_flow_names: dict
+        """
+        with sqlite3_lci_db.atomic():
+            for process_name, flow_units in unit_profiles.items():
+                flow_names = process_flow_names[process_name]
+                if not flow_names:
+                    continue
+                for act in bd.Database(process_name):
+                    for exc in act.biosphere():
+                        # ``exc.input`` would load the flow node for every exchange
+                        flow_name = flow_names.get(exc["input"])
+                        if flow_name is None:
+                            continue
+                        unit = flow_units[flow_name]
+                        exc["temporal_distribution"] = TemporalDistribution(
+                            date=unit.date, amount=unit.amount * exc["amount"]
                         )
-                        exc["temporal_distribution"] = td
                         exc.save()
 
+    @classmethod
+    def _process_flow_names(
+        cls, unit_profiles: Dict[str, Dict[str, TemporalDistribution]]
+    ) -> Dict[str, Dict[Tuple[str, str], str]]:
+        """
+        Return `_flow_names` of the profile of every process.
+
+        Processes with a profile for the same flows (e.g. all materials of a landfill
+        share the landfill gas flows) share one lookup.
+
+        :param unit_profiles: Unit distributions as returned by `_unit_profiles`.
+        :type unit_profiles: dict
+
+        :return: ``{process_name: {(database, code): name}}``
+        :rtype: dict
+        """
+        lookups = {}
+        process_flow_names = {}
+        for process_name, flow_units in unit_profiles.items():
+            names = frozenset(flow_units)
+            if names not in lookups:
+                lookups[names] = cls._flow_names(names)
+            process_flow_names[process_name] = lookups[names]
+        return process_flow_names
+
+    @staticmethod
+    def _flow_names(flow_names: Iterable[str]) -> Dict[Tuple[str, str], str]:
+        """
+        Return the name of every biosphere3 flow named in `flow_names` by key, with one
+        query. Only biosphere3 is searched, like `_lookup_flow_id`, so process activities
+        that share a flow name are not matched.
+
+        :param flow_names: Names of the flows with a temporal profile.
+        :type flow_names: iterable[str]
+
+        :return: ``{(database, code): name}``
+        :rtype: dict
+        """
+        query = ActivityDataset.select(
+            ActivityDataset.database, ActivityDataset.code, ActivityDataset.name
+        ).where(
+            (ActivityDataset.database == "biosphere3") & ActivityDataset.name.in_(list(flow_names))
+        )
+        return {(database, code): name for database, code, name in query.tuples()}
+
+    def _unit_profiles(
+        self, process_temporal_profiles: Dict[str, Dict[str, Dict]]
+    ) -> Dict[str, Dict[str, TemporalDistribution]]:
+        """
+        Build the distribution for an amount of 1 of every profile.
+
+        Exchanges are scaled from these, so the exchange loops only need one ``dict.get``
+        per exchange.
+
+        :param process_temporal_profiles: Profiles as in `attach_temporal_distributions`.
+        :type process_temporal_profiles: dict
+
+        :return: ``{process_name: {flow_name: TemporalDistribution}}``
+        :rtype: dict
+        """
+        # TODO(LCA-REVIEW-PR-2): Document decay constant (k) source and site-specificity
+        # Science review flagged: k=0.05/yr (CH4) and k=0.02/yr (CO2) are illustrative, not validated
+        # Recommendation: Add reference to EPA LandGEM/IPCC Tier 2 for production calibration
+        # Tracked in: ../docs/reviews/Review_PR-2_phase2-prd-dynamic-lca_2026-02-21.md
+        unit_profiles = {}
+        for process_name, flow_profiles in process_temporal_profiles.items():
+            unit_profiles[process_name] = {
+                flow_name: self._build_temporal_distribution(
+                    1.0, profile["kind"], profile.get("params", {})
+                )
+                for flow_name, profile in flow_profiles.items()
+            }
+        return unit_profiles
+
     def _build_temporal_distribution(
         self, amount: float, kind: str, params: dict
     ) -> TemporalDistribution:
@@ -192,37 +633,16 @@ class DynamicLCA:
         :param params: Kind-specific parameters.
         :type params: dict
 
-        :return: TemporalDistribution instance.
+        :return: TemporalDistribution instance. It is cached and shared by all calls
+            with the same arguments, so its arrays are read-only.
         :rtype: TemporalDistribution
         """
-        if kind == "immediate":
-            return TemporalDistribution(
-                date=np.array([0], dtype="timedelta64[Y]"),
-                amount=np.array([amount]),
-            )
-        elif kind == "exponential_decay":
-            k = params["k"]  # decay constant (1/year)
-            period = params["period"]  # years
-            years = np.arange(0, period + 1, dtype=int)
-            # Discretize continuous exponential: amount_i = total * k * exp(-k * t_i)
-            # Normalize so sum equals `amount` (mass balance)
-            raw_amounts = k * np.exp(-k * years)
-            normalized_amounts = (amount / raw_amounts.sum()) * raw_amounts
-            return TemporalDistribution(
-                date=years.astype("timedelta64[Y]"),
-                amount=normalized_amounts,
-            )
-        elif kind == "uniform":
-            start = params.get("start", 0)
-            end = params["end"]
-            steps = params["steps"]
-            years = np.linspace(start, end, steps, dtype=int)
-            return TemporalDistribution(
-                date=years.astype("timedelta64[Y]"),
-                amount=np.full(steps, amount / steps),
-            )
-        else:
-            raise ValueError(f"Unknown temporal distribution kind: {kind}")
+        params_items = tuple(sorted(params.items()))
+        try:
+            hash(params_items)
+        except TypeError:  # Unhashable parameter values can not be cached
+            return _new_temporal_distribution(kind, amount, params)
+        return _cached_temporal_distribution(kind, amount, params_items)
 
     def calculate(
         self,
@@ -232,12 +652,39 @@ class DynamicLCA:
         """
         Run dynamic LCA calculation and return time-resolved GWP as DataFrame.
 
+        Same as ``calculate_arrays(...).to_dataframe()``; see `calculate_arrays`.
+
+        :param characterization_period: Time horizon in years (default 100 per IPCC AR6).
+        :type characterization_period: int
+
+        :param flows_to_characterize: Set of flow names to include (default: CO2, CH4).
+        :type flows_to_characterize: set[str] | None
+
+        :return: DataFrame with columns [year, gwp_kgco2eq, flow, activity].
+        :rtype: pd.DataFrame
+        """
+        return self.calculate_arrays(characterization_period, flows_to_characterize).to_dataframe()
+
+    def calculate_arrays(
+        self,
+        characterization_period: int = 100,
+        flows_to_characterize: Optional[Set[str]] = None,
+    ) -> TimelineResult:
+        """
+        Run dynamic LCA calculation and return time-resolved GWP as arrays.
+
         Steps:
         1. Instantiate TemporalisLCA (graph traversal runs immediately)
         2. Build Timeline from traversal results
+
+        Steps 1 and 2 are reused by later calls as long as `cutoff`, `max_calc` and
+        `starting_datetime` are unchanged, so sweeping the characterization arguments
+        only repeats steps 3 to 5. `attach_temporal_distributions` drops the cached
+        traversal; call `invalidate_traversal` after changing the exchanges or the
+        matrices of `lca_matrix` in any other way.
         3. Characterize CO₂ and CH₄ flows with dynamic radiative forcing
         4. Aggregate to annual resolution
-        5. Return DataFrame
+        5. Return arrays, without building a DataFrame
 
         # TODO(LCA-REVIEW-PR-2): Add GWP100 time horizon justification in docstring
         # Science review flagged: GWP characterization period hardcoded to 100y
@@ -250,82 +697,99 @@ class DynamicLCA:
         :type characterization_period: int
 
         :param flows_to_characterize: Set of flow names to include (default: CO2, CH4).
+            Names without a dynamic characterization function are skipped with a warning.
         :type flows_to_characterize: set[str] | None
 
-        :return: DataFrame with columns [year, gwp_kgco2eq, flow, activity].
-        :rtype: pd.DataFrame
+        :return: Annual GWP per year, flow and activity.
+        :rtype: TimelineResult
         """
         if flows_to_characterize is None:
-            flows_to_characterize = {
-                "Carbon dioxide, fossil",
-                "Carbon dioxide, non-fossil",
-                "Methane, fossil",
-            }
-
-        # Step 1: Instantiate TemporalisLCA (traversal runs in __init__)
-        self._temporalis_lca = TemporalisLCA(
-            lca_object=self.lca_matrix,
-            starting_datetime=self.starting_datetime,
-            cutoff=self.cutoff,
-            max_calc=self.max_calc,
-        )
+            flows_to_characterize = _DEFAULT_FLOWS
+
+        traversal_key = (self.cutoff, self.max_calc, self.starting_datetime)
+        if self._timeline is None or traversal_key != self._traversal_key:
+            # Step 1: Instantiate TemporalisLCA (traversal runs in __init__)
+            self._temporalis_lca = TemporalisLCA(
+                lca_object=self.lca_matrix,
+                starting_datetime=self.starting_datetime,
+                cutoff=self.cutoff,
+                max_calc=self.max_calc,
+            )
 
-        # Step 2: Build timeline
-        self._timeline = self._temporalis_lca.build_timeline()
+            # Step 2: Build timeline
+            self._timeline = self._temporalis_lca.build_timeline()
 
-        # Build dataframe representation (required before characterization)
-        self._timeline.build_dataframe()
+            # Build dataframe representation (required before characterization)
+            self._timeline.build_dataframe()
+            self._timeline_arrays = _timeline_columns(self._timeline.df)
+            self._traversal_key = traversal_key
 
         # Step 3: Characterize flows
         # Get flow node IDs for filtering
-        flow_node_map = {}
+        project = bd.projects.current
+        modified = bd.databases.get("biosphere3", {}).get("modified")
+        groups = {}
         for flow_name in flows_to_characterize:
-            try:
-                results = bd.Database("biosphere3").search(flow_name)
-                if results:
-                    flow_node_map[results[0].id] = flow_name
-            except (IndexError, KeyError):
-                pass  # Flow not found, skip
-
-        co2_flows = {
-            node_id for node_id, name in flow_node_map.items() if "carbon dioxide" in name.lower()
-        }
-        ch4_flows = {
-            node_id for node_id, name in flow_node_map.items() if "methane" in name.lower()
-        }
-
-        df_co2 = (
-            self._timeline.characterize_dataframe(
-                characterization_function=characterize_co2,
-                flow=co2_flows,
-                cumsum=False,  # Annual (not cumulative)
+            characterizer = _CHARACTERIZERS.get(flow_name)
+            if characterizer is None:
+                warnings.warn(f"No dynamic characterization for flow '{flow_name}', skipped")
+                continue
+            node_id = _lookup_flow_id(project, modified, flow_name)
+            if node_id is None:
+                continue  # Flow not found, skip
+            groups.setdefault(characterizer, set()).add(node_id)
+
+        columns = self._timeline_arrays
+        selections = []
+        for characterizer, flows in groups.items():
+            rows = np.flatnonzero(np.isin(columns["flow"], list(flows)))
+            if len(rows):
+                selections.append((characterizer, rows))
+
+        # Step 4: Aggregate to annual
+        if not selections:
+            ids = np.empty(0, dtype=np.int64)
+            return TimelineResult(np.empty(0, dtype=np.int32), np.empty(0), ids, ids)
+        rows = np.concatenate([rows for _, rows in selections])
+        years, amounts = self._work_buffers(len(rows), characterization_period)
+        start = 0
+        for characterizer, group_rows in selections:
+            stop = start + len(group_rows)
+            _characterize_rows(
+                columns["date"][group_rows],
+                columns["amount"][group_rows],
+                characterizer,
+                characterization_period,
+                out=(years[start:stop], amounts[start:stop]),
             )
-            if co2_flows
-            else pd.DataFrame()
-        )
+            start = stop
+        return _annual_totals(years, amounts, columns["flow"][rows], columns["activity"][rows])
 
-        df_ch4 = (
-            self._timeline.characterize_dataframe(
-                characterization_function=characterize_methane,
-                flow=ch4_flows,
-                cumsum=False,
-            )
-            if ch4_flows
-            else pd.DataFrame()
-        )
-
-        # Step 4: Combine and aggregate to annual
-        df_combined = pd.concat([df_co2, df_ch4], ignore_index=True)
-        if df_combined.empty:
-            return pd.DataFrame(columns=["year", "gwp_kgco2eq", "flow", "activity"])
+    def _work_buffers(self, n_rows: int, period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return ``(n_rows, period)`` views of the year and forcing buffers of this instance.
 
-        df_combined["year"] = df_combined["date"].dt.year
-        annual = (
-            df_combined.groupby(["year", "flow", "activity"], as_index=False)
-            .agg({"amount": "sum"})
-            .rename(columns={"amount": "gwp_kgco2eq"})
+        The buffers only grow, so repeated `calculate` calls (e.g. sweeping the
+        characterization period) do not allocate them again. The views are overwritten
+        by the next call and must not be returned to the caller.
+        """
+        size = n_rows * period
+        if self._year_buf is None or self._year_buf.size < size:
+            self._year_buf = np.empty(size, dtype=np.int64)
+            self._gwp_buf = np.empty(size)
+        return (
+            self._year_buf[:size].reshape(n_rows, period),
+            self._gwp_buf[:size].reshape(n_rows, period),
         )
-        return annual.sort_values("year").reset_index(drop=True)
+
+    def invalidate_traversal(self) -> None:
+        """
+        Drop the cached graph traversal, so the next `calculate` traverses again.
+        """
+        self._temporalis_lca = None
+        self._timeline = None
+        self._timeline_arrays = None
+        self._traversal_key = None
 
     def get_timeline(self) -> Timeline:
         """
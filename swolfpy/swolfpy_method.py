@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
+import ast
 import os
 import warnings
 
 import bw2data as bd
+import numpy as np
 import pandas as pd
 import swolfpy_inputdata.data.lcia_methods as m
+from bw2data.backends import ActivityDataset
 
 
 def import_methods(path_to_methods=None):
@@ -12,7 +15,8 @@ def import_methods(path_to_methods=None):
     Imports the user defined LCIA methods from the csv files in the path.
 
     Characterisation factors (CFs) whose biosphere flow cannot be found in
-    bw2data are silently skipped with a warning.  This handles two cases:
+    bw2data are silently skipped with a warning; a method without any valid CF
+    is still registered, without CFs.  This handles two cases:
 
     * Legacy ecoinvent 3.5 UUIDs that changed in newer biosphere3 datasets
       bundled with bw2io ≥0.9.
@@ -28,22 +32,29 @@ def import_methods(path_to_methods=None):
     """
     if not path_to_methods:
         path_to_methods = m.__path__[0]
-    files = os.listdir(path_to_methods)
-    for f in files:
-        if ".csv" not in f:
-            continue
-        df = pd.read_csv(path_to_methods + "/" + f)
-        CF = []
-        skipped = 0
-        for i in df.index:
-            key = eval(df["key"][i])
-            # bw2data ≥4.0 Method.write() resolves (db, code) tuples to integer
-            # node IDs; validate existence here so we can skip gracefully.
-            try:
-                bd.get_node(database=key[0], code=key[1])
-                CF.append((key, df["value"][i]))
-            except bd.errors.UnknownObject:
-                skipped += 1
+    with os.scandir(path_to_methods) as entries:
+        files = [entry for entry in entries if entry.name.endswith(".csv") and entry.is_file()]
+    # Node IDs by code in each referenced database, read once per call. Not cached
+    # across calls: the cost flows are only created by ``Create_Technosphere()``.
+    node_ids = {}
+    for entry in files:
+        f = entry.name
+        df = pd.read_csv(
+            entry.path,
+            usecols=["key", "value", "unit"],
+            dtype={"value": "float64"},
+        )
+        keys = df["key"].map(ast.literal_eval).to_numpy()
+        # bw2data ≥4.0 Method.write() resolves (db, code) tuples to integer
+        # node IDs one query at a time; resolve them here so we can skip gracefully.
+        for database in {key[0] for key in keys} - node_ids.keys():
+            node_ids[database] = _node_ids(database)
+        ids = np.fromiter(
+            (node_ids[key[0]].get(key[1], -1) for key in keys), dtype=np.int64, count=len(keys)
+        )
+        mask = ids != -1
+        CF = list(zip(ids[mask].tolist(), df["value"].to_numpy()[mask].tolist()))
+        skipped = int((~mask).sum())
 
         if skipped:
             warnings.warn(
@@ -54,7 +65,14 @@ def import_methods(path_to_methods=None):
                 stacklevel=2,
             )
 
-        name = eval(f[:-4])
+        if not CF:
+            warnings.warn(
+                f"import_methods: '{f}' produced no valid characterisation factors, "
+                "registering it without characterisation factors.",
+                stacklevel=2,
+            )
+
+        name = ast.literal_eval(f[:-4])
         bd.Method(name).register(
             **{
                 "unit": df["unit"][0],
@@ -66,3 +84,18 @@ def import_methods(path_to_methods=None):
         if CF:
             bd.Method(name).write(CF)
     # methods.flush() is called internally by Method.write() in Brightway 2.5
+
+
+def _node_ids(database):
+    """
+    Returns the IDs of all nodes in `database` by code with one query.
+
+    :param database: Name of the database.
+    :type database: str
+
+    :rtype: dict
+    """
+    query = ActivityDataset.select(ActivityDataset.code, ActivityDataset.id).where(
+        ActivityDataset.database == database
+    )
+    return dict(query.tuples())
@@ -44,6 +44,15 @@ BIOSPHERE_UUID_MIGRATION: Dict[str, str] = {
 # Used by tests to reconcile migrated DB keys with legacy report keys.
 _REVERSE_MIGRATION: Dict[str, str] = {v: k for k, v in BIOSPHERE_UUID_MIGRATION.items()}
 
+# Same tables keyed by the full ``("biosphere3", code)`` tuple, so that a lookup
+# is a single ``dict.get`` for every exchange written to the database.
+_QUALIFIED_MIGRATION: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("biosphere3", old): ("biosphere3", new) for old, new in BIOSPHERE_UUID_MIGRATION.items()
+}
+_QUALIFIED_REVERSE_MIGRATION: Dict[Tuple[str, str], Tuple[str, str]] = {
+    new: old for old, new in _QUALIFIED_MIGRATION.items()
+}
+
 
 def migrate_biosphere_key(key: Tuple[str, str]) -> Tuple[str, str]:
     """
@@ -57,11 +66,11 @@ def migrate_biosphere_key(key: Tuple[str, str]) -> Tuple[str, str]:
     :return: The same key or its migrated replacement
     :rtype: tuple[str, str]
     """
-    if isinstance(key, tuple) and len(key) == 2 and key[0] == "biosphere3":
-        new_code = BIOSPHERE_UUID_MIGRATION.get(key[1])
-        if new_code:
-            return ("biosphere3", new_code)
-    return key
+    try:
+        return _QUALIFIED_MIGRATION.get(key, key)
+    except TypeError:
+        # Unhashable keys can not be in the table.
+        return key
 
 
 def original_biosphere_key(key: Tuple[str, str]) -> Tuple[str, str]:
@@ -78,8 +87,8 @@ def original_biosphere_key(key: Tuple[str, str]) -> Tuple[str, str]:
     :return: The original key (before UUID migration) or the key unchanged
     :rtype: tuple[str, str]
     """
-    if isinstance(key, tuple) and len(key) == 2 and key[0] == "biosphere3":
-        old_code = _REVERSE_MIGRATION.get(key[1])
-        if old_code:
-            return ("biosphere3", old_code)
-    return key
+    try:
+        return _QUALIFIED_REVERSE_MIGRATION.get(key, key)
+    except TypeError:
+        # Unhashable keys can not be in the table.
+        return key
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the swolfpy test suite.
+"""
+
+import bw2data as bd
+
+
+def _ensure_project(name):
+    """
+    Activate the Brightway2 project ``name`` unless it is already the current one.
+
+    ``bd.projects.set_current`` reloads the project metadata and reopens the SQLite
+    databases even when ``name`` is already active.
+
+    :param name: Name of the project
+    :type name: str
+    """
+    if str(bd.projects.current) != name:
+        bd.projects.set_current(name)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the sparse matrix helpers in ``swolfpy.LCA_matrix``.
+"""
+
+import collections
+import pickle
+
+import bw2data as bd
+import numpy as np
+import pytest
+import scipy.sparse
+
+import swolfpy.LCA_matrix as lca_module
+from swolfpy.LCA_matrix import LCA_matrix, MatrixDict
+
+KEYS = [
+    (("LF", "Material_1"), ("scenario", "Scenario_1")),
+    (("WTE", "Material_1"), ("scenario", "Scenario_1")),
+    (("LF", "Material_1"), ("LF", "Material_1")),
+]
+
+
+def test_matrix_dict_reads_and_writes_array():
+    """
+    Test that MatrixDict behaves like a dict whose values live in ``array``.
+    """
+    matrix = MatrixDict(KEYS, np.array([-0.5, -0.5, 1.0]))
+
+    assert len(matrix) == 3
+    assert list(matrix) == KEYS
+    assert KEYS[1] in matrix
+    assert matrix[KEYS[0]] == -0.5
+
+    matrix[KEYS[1]] = -0.25
+    assert matrix.array[1] == -0.25
+    assert list(matrix.values()) == [-0.5, -0.25, 1.0]
+
+
+def test_matrix_dict_has_fixed_keys():
+    """
+    Test that the sparsity pattern can not be changed through the dict interface.
+    """
+    matrix = MatrixDict(KEYS, np.array([-0.5, -0.5, 1.0]))
+
+    with pytest.raises(KeyError):
+        matrix[(("LF", "Material_2"), ("scenario", "Scenario_1"))] = 1.0
+    with pytest.raises(TypeError):
+        del matrix[KEYS[0]]
+
+
+def test_matrix_dict_pickle_roundtrip():
+    """
+    Test that MatrixDict survives pickling (Monte Carlo workers receive a copy).
+    """
+    matrix = MatrixDict(KEYS, np.array([-0.5, -0.5, 1.0]))
+    copy = pickle.loads(pickle.dumps(matrix))
+
+    copy[KEYS[0]] = -0.75
+    assert copy[KEYS[0]] == -0.75
+    assert matrix[KEYS[0]] == -0.5
+    assert dict(copy) == {KEYS[0]: -0.75, KEYS[1]: -0.5, KEYS[2]: 1.0}
+
+
+def test_csr_structure_matches_coo():
+    """
+    Test that the precomputed CSR layout rebuilds the same matrix as the COO input.
+    """
+    rows = np.array([2, 0, 1, 0, 2], dtype=np.int32)
+    cols = np.array([1, 2, 0, 0, 2], dtype=np.int32)
+    values = np.array([5.0, 2.0, 3.0, 1.0, 4.0])
+
+    perm, indices, indptr = LCA_matrix._csr_structure(rows, cols, 3)
+    rebuilt = scipy.sparse.csr_matrix((values[perm], indices, indptr), shape=(3, 3))
+    expected = scipy.sparse.coo_matrix((values, (rows, cols)), shape=(3, 3))
+
+    assert rebuilt.has_sorted_indices
+    assert np.array_equal(rebuilt.toarray(), expected.toarray())
+
+
+def _report(amount):
+    return {
+        "process name": ("LF", "LF"),
+        "Technosphere": {"Material_1": {("Technosphere", "Electricity"): amount}},
+        "Waste": {"Material_1": {"Bottom_Ash": 0.1}},
+    }
+
+
+def test_update_techmatrix():
+    """
+    Test that update_techmatrix writes report amounts and rejects NaN or unknown exchanges.
+    """
+    elec_key = (("Technosphere", "Electricity"), ("LF", "Material_1"))
+    ash_key = (("LF_product", "Material_1_Bottom_Ash"), ("LF", "Material_1"))
+    tech_matrix = MatrixDict([elec_key, ash_key], np.array([1.0, 0.2]))
+
+    LCA_matrix.update_techmatrix("LF", _report(2.0), tech_matrix)
+    assert tech_matrix[elec_key] == 2.0
+    assert tech_matrix[ash_key] == 0.1
+
+    with pytest.raises(ValueError, match="Nan"):
+        LCA_matrix.update_techmatrix("LF", _report(float("nan")), tech_matrix)
+    with pytest.raises(KeyError, match="not exist in LCA technosphere"):
+        LCA_matrix.update_techmatrix("WTE", _report(2.0), tech_matrix)
+
+
+def test_matrix_dict_set_many_is_atomic():
+    """
+    Test that set_many writes all amounts at once and nothing when a key is unknown.
+    """
+    matrix = MatrixDict(KEYS, np.array([-0.5, -0.5, 1.0]))
+
+    matrix.set_many([KEYS[2], KEYS[0]], np.array([2.0, -1.0]))
+    assert matrix.array.tolist() == [-1.0, -0.5, 2.0]
+
+    unknown = (("LF", "Material_2"), ("scenario", "Scenario_1"))
+    with pytest.raises(KeyError):
+        matrix.set_many([KEYS[1], unknown], np.array([0.0, 0.0]))
+    assert matrix.array.tolist() == [-1.0, -0.5, 2.0]
+
+
+def test_update_techmatrix_transfer_station():
+    """
+    Test that the stream prefix of Transfer_Station materials is removed for waste products.
+    """
+    report = {
+        "process name": ("TS", "Transfer_Station"),
+        "Technosphere": {},
+        "Waste": {
+            "DryRes_Paper": {"Paper": 0.5},
+            "ORG_Food": {"Food": 0.25},
+        },
+    }
+    dry_key = (("TS_product", "Paper_Paper"), ("TS", "DryRes_Paper"))
+    org_key = (("TS_product", "Food_Food"), ("TS", "ORG_Food"))
+    tech_matrix = MatrixDict([dry_key, org_key], np.array([1.0, 1.0]))
+
+    LCA_matrix.update_techmatrix("TS", report, tech_matrix)
+    assert tech_matrix[dry_key] == 0.5
+    assert tech_matrix[org_key] == 0.25
+
+
+def test_update_techmatrix_lci_without_waste():
+    """
+    Test that the transport LCI of a collection report is written even without waste.
+    """
+    report = {
+        "process name": ("SF_COl", "SF_Col"),
+        "Technosphere": {},
+        "Waste": {},
+        "LCI": {
+            "RWC": {
+                "LF": {
+                    ("Technosphere", "Heavy_Duty_Truck"): 2.0,
+                    ("biosphere3", "co2-fossil"): 5.0,
+                }
+            }
+        },
+    }
+    truck_key = (("Technosphere", "Heavy_Duty_Truck"), ("SF_COl_product", "RWC_to_LF"))
+    tech_matrix = MatrixDict([truck_key], np.array([1.0]))
+
+    LCA_matrix.update_techmatrix("SF_COl", report, tech_matrix)
+    assert tech_matrix[truck_key] == 2.0
+
+    # Unknown transport exchanges are reported even though there is no waste
+    report["LCI"]["RWC"]["WTE"] = {("Technosphere", "Heavy_Duty_Truck"): 1.0}
+    with pytest.raises(KeyError, match="not exist in LCA technosphere"):
+        LCA_matrix.update_techmatrix("SF_COl", report, tech_matrix)
+
+
+@pytest.fixture
+def tiny_lca():
+    """
+    Two-activity system without a database: activity 0 uses 0.5 of activity 1 and each
+    emits one flow with characterization factors 1 and 2.
+    """
+    rows = np.array([0, 1, 1], dtype=np.int32)
+    cols = np.array([0, 0, 1], dtype=np.int32)
+
+    lca = LCA_matrix.__new__(LCA_matrix)
+    lca._tech_shape = (2, 2)
+    lca._tech_perm, lca._tech_indices, lca._tech_indptr = LCA_matrix._csr_structure(rows, cols, 2)
+    lca.tech_matrix = MatrixDict(KEYS, np.array([1.0, -0.5, 1.0]))
+    lca._tech_csr = scipy.sparse.csr_matrix(
+        (np.empty(3), lca._tech_indices, lca._tech_indptr), shape=lca._tech_shape
+    )
+    lca.rebuild_technosphere_matrix()
+    lca.biosphere_matrix = scipy.sparse.csr_matrix(np.eye(2))
+    lca.characterization_matrix = scipy.sparse.diags([1.0, 2.0])
+    lca.demand_array = np.array([1.0, 0.0])
+    return lca
+
+
+def test_run_monte_carlo(tiny_lca):
+    """
+    Test that run_monte_carlo solves every sample and gives the same scores in parallel.
+    """
+    samples = np.array([[1.0, -0.5, 1.0], [1.0, -0.25, 1.0], [2.0, -1.0, 1.0]])
+
+    scores = tiny_lca.run_monte_carlo(samples)
+    assert np.allclose(scores, [2.0, 1.5, 1.5])
+    assert np.array_equal(tiny_lca.run_monte_carlo(samples, n_workers=2), scores)
+
+    with pytest.raises(ValueError, match="n_samples"):
+        tiny_lca.run_monte_carlo(samples[:, :2])
+
+
+def test_solve_reuses_factorization_until_rebuild(tiny_lca):
+    """
+    Test that solve factorizes once and that a rebuild drops the stale factorization.
+    """
+    assert np.allclose(tiny_lca.solve(np.array([1.0, 0.0])), [1.0, 0.5])
+    solver = getattr(tiny_lca, "solver", None)
+    assert np.allclose(tiny_lca.solve(np.array([0.0, 1.0])), [0.0, 1.0])
+    assert getattr(tiny_lca, "solver", None) is solver
+
+    tiny_lca.tech_matrix[KEYS[1]] = -0.25
+    tiny_lca.rebuild_technosphere_matrix()
+    assert np.allclose(tiny_lca.solve(np.array([1.0, 0.0])), [1.0, 0.25])
+
+
+def test_rebuild_rejects_values_that_need_a_copy(tiny_lca):
+    """
+    Test that the rebuild fails fast instead of silently converting the values.
+    """
+    with pytest.raises(ValueError, match="3 exchange amounts"):
+        tiny_lca.rebuild_technosphere_matrix(np.ones(2))
+    with pytest.raises(ValueError, match="float64"):
+        tiny_lca.rebuild_technosphere_matrix(np.ones(3, dtype=np.float32))
+    with pytest.raises(ValueError, match="strided"):
+        tiny_lca.rebuild_technosphere_matrix(np.ones(6)[::2])
+
+
+def test_lca_input_cache_is_bounded(monkeypatch):
+    """
+    Test that inputs built from older data are dropped and that the cache size is bounded.
+    """
+    monkeypatch.setattr(lca_module, "_LCA_INPUT_CACHE", collections.OrderedDict())
+    monkeypatch.setattr(lca_module, "_LCA_INPUT_CACHE_SIZE", 2)
+    cache = lca_module._LCA_INPUT_CACHE
+
+    def cached(key):
+        return lca_module._cached_lca_inputs(key, lambda: ("inputs", key))
+
+    assert cached(("p", "fu", "m", 1)) == ("inputs", ("p", "fu", "m", 1))
+    assert cached(("p", "fu", "m", 1)) is cached(("p", "fu", "m", 1))
+
+    # Newer data for the same LCA replaces the older inputs
+    cached(("p", "fu", "m", 2))
+    assert list(cache) == [("p", "fu", "m", 2)]
+
+    # Least recently used LCA is dropped first
+    cached(("p", "fu", "other", 1))
+    cached(("p", "fu", "m", 2))
+    cached(("p", "fu", "third", 1))
+    assert list(cache) == [("p", "fu", "m", 2), ("p", "fu", "third", 1)]
+
+
+def test_prepare_lca_inputs_checks_method_and_copies_remapping(monkeypatch):
+    """
+    Test that an unknown method is reported by bw2data and that callers cannot modify the
+    cached remapping dicts.
+    """
+    monkeypatch.setattr(lca_module, "_LCA_INPUT_CACHE", collections.OrderedDict())
+    # Start from an empty project: looking up an unknown method must not register it
+    if "test_lca_inputs" in bd.projects:
+        bd.projects.delete_project("test_lca_inputs", delete_dir=True)
+    bd.projects.set_current("test_lca_inputs")
+    bd.Database("lca_inputs").write(
+        {
+            ("lca_inputs", "CO2"): {"name": "CO2", "type": "emission"},
+            ("lca_inputs", "LF"): {
+                "name": "LF",
+                "exchanges": [
+                    {"input": ("lca_inputs", "LF"), "amount": 1.0, "type": "production"},
+                    {"input": ("lca_inputs", "CO2"), "amount": 2.0, "type": "biosphere"},
+                ],
+            },
+        }
+    )
+    bd.Method(("lca_inputs", "GWP")).register()
+    bd.Method(("lca_inputs", "GWP")).write([(("lca_inputs", "CO2"), 1.0)])
+    functional_unit = {bd.get_node(database="lca_inputs", code="LF"): 1.0}
+
+    with pytest.raises(AssertionError):
+        LCA_matrix._prepare_lca_inputs(functional_unit, ("lca_inputs", "unknown"))
+    assert ("lca_inputs", "unknown") not in bd.methods
+
+    _, _, remapping = LCA_matrix._prepare_lca_inputs(functional_unit, ("lca_inputs", "GWP"))
+    remapping["activity"] = {}
+    _, _, remapping = LCA_matrix._prepare_lca_inputs(functional_unit, ("lca_inputs", "GWP"))
+    assert remapping["activity"]
+    assert len(lca_module._LCA_INPUT_CACHE) == 1
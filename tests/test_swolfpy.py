@@ -3,14 +3,59 @@
 Tests for `swolfpy` package.
 """
 
+import shutil
+import subprocess
+import sys
+
 import bw2data as bd
+import pytest
+import swolfpy_inputdata.data.lcia_methods as lcia_methods
 from swolfpy_inputdata import CommonData
 from swolfpy_processmodels import LF, WTE, Distance, SF_Col
 
-from swolfpy import Project, Technosphere
+from swolfpy import Project, Technosphere, import_methods
 from swolfpy.uuid_migration import original_biosphere_key
 
 
+def test_submodule_import_keeps_classes():
+    """
+    Test that importing a submodule first still binds the classes to the package names.
+    """
+    # Fresh interpreter: the submodules are already imported in this one
+    code = (
+        "import inspect, swolfpy.Project, swolfpy.Monte_Carlo, swolfpy.Optimization\n"
+        "from swolfpy import Monte_Carlo, Optimization, Project, Technosphere\n"
+        "import swolfpy.Technosphere as Tech\n"
+        "names = (Monte_Carlo, Optimization, Project, Technosphere, Tech)\n"
+        "assert all(map(inspect.isclass, names)), names\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_methods_registers_methods_without_cfs(tmp_path):
+    """
+    Test that a cost method is registered before its flows exist and filled in later.
+    """
+    name = ("SwolfPy_Capital_Cost", "SwolfPy")
+    shutil.copy(f"{lcia_methods.__path__[0]}/{name}.csv", tmp_path / f"{name}.csv")
+    # Start from an empty project: a previous run leaves the cost flow and method behind
+    if "test_import_methods" in bd.projects:
+        bd.projects.delete_project("test_import_methods", delete_dir=True)
+    bd.projects.set_current("test_import_methods")
+    bd.Database("biosphere3").write({})
+
+    # Before Create_Technosphere() the cost flow does not exist yet
+    with pytest.warns(UserWarning, match="no valid characterisation factors"):
+        import_methods(str(tmp_path))
+    assert name in bd.methods
+
+    bd.Database("biosphere3").write(
+        {("biosphere3", "Capital_Cost"): {"name": "Capital Cost", "type": "economic"}}
+    )
+    import_methods(str(tmp_path))
+    assert bd.Method(name).load() == [(bd.get_node(code="Capital_Cost").id, 1.0)]
+
+
 def test_demo_swolfpy():
     project_name = "test_demo"
     technosphere = Technosphere(project_name)